@@ -0,0 +1,170 @@
+"""
+Hot path of search(): matching elements against the compiled query
+Kept in a separate module with plain types only (dict, list, tuple, str)
+so it can be compiled with mypyc (`mypyc _core.py`) without changing the behavior
+NOTE: object_from_list is annotated as Any on purpose - it may be any element value,
+compiled code checks annotated types at runtime
+"""
+from typing import Any, Callable, NamedTuple
+
+_MISSING = object()  # dict.get() default, the value itself may be None
+
+
+class Clause(NamedTuple):
+    """
+    Compiled query field: the key is parsed once, not per element
+    For example, 'author.name__contains': 'oh' becomes
+    Clause(path=('author', 'name'), operator='contains', value='oh', compare=op_contains)
+    """
+    path: tuple[str, ...]
+    operator: str | None
+    value: Any
+    compare: Callable[[Any, Any], bool]
+
+
+def op_eq(object_from_list: Any, search_value: Any) -> bool:
+    return object_from_list == search_value
+
+
+def op_in(object_from_list: Any, search_value: Any) -> bool:
+    try:
+        return object_from_list in search_value
+    except TypeError:
+        # unhashable element can't be in frozenset of hashable values (see _prepare_value())
+        if type(search_value) is frozenset:
+            return False
+        raise
+
+
+def op_contains(object_from_list: Any, search_value: Any) -> bool:
+    return search_value in object_from_list
+
+
+def op_contains_elements_from_list(object_from_list: Any, search_value: Any) -> bool:
+    if isinstance(search_value, list):
+        return all(item in object_from_list for item in search_value)
+    return search_value in object_from_list
+
+
+def op_gt(object_from_list: Any, search_value: Any) -> bool:
+    return object_from_list > search_value
+
+
+def op_gte(object_from_list: Any, search_value: Any) -> bool:
+    return object_from_list >= search_value
+
+
+def op_lt(object_from_list: Any, search_value: Any) -> bool:
+    return object_from_list < search_value
+
+
+def op_lte(object_from_list: Any, search_value: Any) -> bool:
+    return object_from_list <= search_value
+
+
+def op_isnull(object_from_list: Any, search_value: Any) -> bool:
+    return bool(object_from_list) != search_value
+
+
+# lookup name -> compare function, None means plain equality
+OPERATORS: dict[str | None, Callable[[Any, Any], bool]] = {
+    None: op_eq,
+    "in": op_in,
+    "contains": op_contains,
+    "contains_elements_from_list": op_contains_elements_from_list,
+    "gt": op_gt,
+    "gte": op_gte,
+    "lt": op_lt,
+    "lte": op_lte,
+    "isnull": op_isnull,
+}
+
+
+def match_query(object_from_list: Any, plan: list[Clause]) -> bool:
+    """
+    Check if object_from_list matches all clauses of the compiled query
+    For example:
+    object_from_list = {
+        'a': {
+            'b': 1
+        },
+        'c': 1
+    }
+    plan = list_search._compile_query({
+        'a.b': 1
+    })
+    returns True
+    """
+    for clause in plan:
+        if not match_path(object_from_list, clause.path, 0, clause.value, clause.compare):
+            return False
+    return True
+
+
+def match_path(
+        object_from_list: Any,
+        path: tuple[str, ...],
+        index: int,
+        search_value: Any,
+        compare: Callable[[Any, Any], bool] = op_eq,
+) -> bool:
+    """
+    Searching search_value in object by path, starting from path[index]
+    (path is not sliced, we just move the index on every nesting level)
+    compare is the lookup function from OPERATORS, resolved once in the compiled clause
+    Walks the object in a loop, not recursively: dicts are descended in place,
+    for the lists an iterator is put on the stack and items are taken from it one by one -
+    the path matches if any of them matches the rest of it (checking stops on the first match)
+    A list which contains itself (directly or deeper) is not walked again while it is being walked,
+    so such element just doesn't match instead of looping forever
+    For example:
+    object_from_list = {
+        'a': {
+            'b': 1
+        },
+        'c': 1
+    }
+    path = ('a', 'b')
+    index = 0
+    search_value = 1
+    returns True
+    """
+    path_length = len(path)
+    stack = []  # (iterator over the list items, path index, id of the list) for every list being walked
+    walking = set()  # ids of the lists on the stack
+    current = object_from_list
+    while True:
+        while index < path_length:
+            # elements usually are plain dicts / lists, so check the exact type before isinstance
+            if type(current) is dict:
+                current = current.get(path[index], _MISSING)
+                if current is _MISSING:
+                    break
+                index += 1
+            elif type(current) is list or isinstance(current, list):
+                list_id = id(current)
+                if list_id not in walking:
+                    walking.add(list_id)
+                    stack.append((iter(current), index, list_id))
+                break
+            elif isinstance(current, dict):  # OrderedDict, defaultdict, etc.
+                if path[index] not in current:
+                    break
+                current = current[path[index]]
+                index += 1
+            else:
+                break
+        else:
+            if compare(current, search_value):
+                return True
+
+        # take the next item of the innermost list, finished lists are removed from the stack
+        while stack:
+            items, index, list_id = stack[-1]
+            current = next(items, _MISSING)
+            if current is not _MISSING:
+                break
+            stack.pop()
+            walking.discard(list_id)
+        else:
+            return False
@@ -1,6 +1,23 @@
 import re
-from copy import deepcopy
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import chain, repeat
+from operator import itemgetter
+from typing import Any, Callable, Iterator, NamedTuple
+
+from ._core import OPERATORS, Clause, match_query
+
+try:
+    import re2  # optional, linear-time DFA engine (google-re2 / pyre2), see use_re2()
+except ImportError:
+    re2 = None
+
+_USE_RE2 = False
+
+try:
+    import numpy as np  # optional, used by search_vectorized()
+except ImportError:
+    np = None
 
 SUPPORTED_FILTERING_LOOKUPS = [
     "__in",
@@ -12,11 +29,16 @@ SUPPORTED_FILTERING_LOOKUPS = [
     "__lte",
     "__isnull",
 ]
+# search(workers=N) checks lists shorter than this in the current thread, threads cost more there
+_PARALLEL_MIN_LENGTH = 10_000
+# lookup names without leading "__", so the key suffix is resolved with one set lookup
+_LOOKUP_NAMES = frozenset(lookup.removeprefix("__") for lookup in SUPPORTED_FILTERING_LOOKUPS)
 
 
 def search(
         lst: list[Any],
         element_or_query: dict | Any,
+        workers: int = 1,
 ) -> list[Any]:
     """
     Search element in the list
@@ -37,12 +59,43 @@ def search(
         likes__gte: 100
     }
     NOTE: author is dict, hashtags is list of dict, so you can do nested search
+    NOTE: __regex__ checks only str and int elements (int is matched by its str()), other elements are dropped
     See supported filtering operators in SUPPORTED_FILTERING_LOOKUPS
+    NOTE: returned list contains references to the original elements (not copies), like filter() does
+    If you need only first matches, use isearch() - it doesn't walk the rest of the list
+    workers > 1 splits big lists (see _PARALLEL_MIN_LENGTH) into chunks and checks them in threads,
+    the order of elements is kept. Makes sense on free-threaded python (3.13+), with GIL it's not faster
+    """
+    if workers > 1 and len(lst) >= _PARALLEL_MIN_LENGTH and not _is_index_query(element_or_query):
+        chunk_size = -(-len(lst) // workers)  # ceil division
+        chunks = [lst[start:start + chunk_size] for start in range(0, len(lst), chunk_size)]
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(search, chunks, repeat(element_or_query))
+            return list(chain.from_iterable(results))
+    return list(isearch(lst, element_or_query))
+
+
+def _is_index_query(element_or_query: dict | Any) -> bool:
+    # __index__ picks one element by position in the whole list, so it can't be split into chunks
+    return isinstance(element_or_query, dict) and "__index__" in element_or_query
+
+
+def isearch(
+        lst: list[Any],
+        element_or_query: dict | Any,
+) -> Iterator[Any]:
+    """
+    Same as search(), but lazy - yields matching elements one by one
+    So you can stop on the first match, without checking the rest of the list:
+    next(isearch(lst, query), None)
+    or take first N matches:
+    list(islice(isearch(lst, query), N))
     """
-    matches = deepcopy(lst)  # then we'll filter out elements, that match criteria
+    matches = lst  # then we'll filter out elements, that match criteria
 
     if not isinstance(element_or_query, dict):
-        return [item for item in matches if item == element_or_query]
+        yield from (item for item in lst if item == element_or_query)
+        return
 
     if "__index__" in element_or_query:
         index_val = element_or_query["__index__"]
@@ -52,25 +105,168 @@ def search(
             index = 0 if index_val == "first" else -1
         matches = [_get_element_or_query_by_index(matches, index)]
 
-    if "__regex__" in element_or_query:
-        element_or_queries_to_match = [item for item in matches if isinstance(item, str | int)]
-        match_res = [
-            item
-            for item in element_or_queries_to_match
-            if re.match(element_or_query["__regex__"], str(item))
-        ]
-        matches = [item for item in matches if item in match_res]
+    # resolve all the clauses once, then check every element against them in a single pass
+    pattern = _compile(element_or_query["__regex__"]) if "__regex__" in element_or_query else None
+    plan = _compile_query(element_or_query)  # empty if there are only reserved keys (like above)
+
+    if pattern is None and not plan:
+        yield from matches
+        return
+
+    regex_match = pattern.match if pattern is not None else None
+    # cheapest checks go first: type check -> regex -> fields walk
+    for item in matches:
+        if regex_match is not None:
+            # strings are matched as is, only ints need str() (and a new string object)
+            if isinstance(item, str):
+                if not regex_match(item):
+                    continue
+            elif not isinstance(item, int) or not regex_match(str(item)):
+                continue
+        if plan and not match_query(item, plan):
+            continue
+        yield item
+
 
-    # if these are not reserved keys (like above)
-    if any(key for key in list(element_or_query.keys()) if not key.startswith("__")):
-        fields_query = {
-            key: element_or_query[key]
-            for key in list(element_or_query.keys())
-            if not key.startswith("__")
-        }
-        matches = [item for item in matches if _match_query(item, fields_query)]
+_INT64_MIN, _INT64_MAX = -(2 ** 63), 2 ** 63 - 1
+# lookups which can be evaluated on the whole column at once
+_VECTORIZED_LOOKUPS = {
+    None: lambda column, value: column == value,
+    "in": lambda column, value: np.isin(column, list(value)),
+    "gt": lambda column, value: column > value,
+    "gte": lambda column, value: column >= value,
+    "lt": lambda column, value: column < value,
+    "lte": lambda column, value: column <= value,
+}
 
-    return matches
+
+def search_vectorized(
+        lst: list[Any],
+        element_or_query: dict | Any,
+) -> list[Any]:
+    """
+    Same as search(), but evaluates the query on NumPy arrays (requires numpy)
+    Made for big lists of flat dicts with scalar fields, like rows of a table:
+    every field from the query becomes one column, lookups are computed for the whole column at once
+    Supported: plain fields (no dots), where the column and the query value are all int, all float or all str,
+    lookups __in, __gt, __gte, __lt, __lte
+    Any other query (nested paths, dunders, other lookups, missing fields, mixed types like int and float,
+    bools, strings with "\x00", NaN in __in) falls back to search(), so the result is always the same
+    """
+    if np is None or not lst or not isinstance(element_or_query, dict):
+        return search(lst, element_or_query)
+    if any(key.startswith("__") for key in element_or_query):
+        return search(lst, element_or_query)
+    if set(map(type, lst)) != {dict}:
+        return search(lst, element_or_query)
+
+    mask = None
+    for clause in _compile_query(element_or_query):
+        clause_mask = _vectorized_mask(lst, clause)
+        if clause_mask is None:
+            return search(lst, element_or_query)
+        mask = clause_mask if mask is None else mask & clause_mask
+        if not mask.any():
+            return []
+
+    if mask is None:
+        return list(lst)
+    return [lst[index] for index in np.flatnonzero(mask)]
+
+
+def _vectorized_mask(lst: list[dict], clause: Clause) -> Any:
+    """
+    Boolean mask of the elements matching the clause, or None if clause can't be vectorized
+    """
+    if len(clause.path) != 1 or clause.operator not in _VECTORIZED_LOOKUPS:
+        return None
+    key = clause.path[0]
+    try:
+        values = list(map(itemgetter(key), lst))
+    except KeyError:
+        return None
+
+    if clause.operator == "in":
+        # `value in "some string"` is a substring check, leave it to search()
+        if not isinstance(clause.value, list | tuple | set | frozenset):
+            return None
+        search_values = list(clause.value)
+    else:
+        search_values = [clause.value]
+    kind = _get_column_kind(values)
+    if kind is None or (search_values and _get_column_kind(search_values) != kind):
+        return None
+    if kind == "int" and not all(_INT64_MIN <= value <= _INT64_MAX for value in search_values):
+        return None
+    # NumPy str dtype drops trailing "\x00", so "a\x00" would be equal to "a"
+    if kind == "str" and ("\x00" in "".join(values) or "\x00" in "".join(search_values)):
+        return None
+
+    column = np.array(values)
+    if column.dtype.kind not in "ifU":  # e.g. object dtype for ints which don't fit into int64
+        return None
+    # python finds the same NaN object in the frozenset (identity check), NumPy never matches NaN
+    if kind == "float" and clause.operator == "in" and (
+        np.isnan(column).any() or any(value != value for value in search_values)
+    ):
+        return None
+    try:
+        return np.asarray(_VECTORIZED_LOOKUPS[clause.operator](column, clause.value), dtype=bool)
+    except (TypeError, OverflowError):
+        return None
+
+
+def _get_column_kind(values: list) -> str | None:
+    """
+    Returns 'int', 'float' or 'str' if all values are of exactly this type, otherwise None
+    Mixes (like int and float) fall back to search(): NumPy would cast them to float64 and lose precision
+    """
+    types = set(map(type, values))
+    if types == {int}:
+        return "int"
+    if types == {float}:
+        return "float"
+    if types == {str}:
+        return "str"
+    return None
+
+
+def use_re2(enabled: bool = True) -> None:
+    """
+    Match __regex__ with re2 instead of re (requires google-re2 / pyre2)
+    re2 runs in linear time (no catastrophic backtracking), but it matches differently:
+    \\d, \\w, \\s are ASCII-only (r'\\d' doesn't match '٣'),
+    $ doesn't match before a trailing newline (r'^\\d{3}$' doesn't match '123\\n'),
+    backreferences and lookarounds are not supported (such patterns are compiled with re)
+    """
+    global _USE_RE2
+    if enabled and re2 is None:
+        raise ImportError("re2 is not installed, install list_search[re2]")
+    _USE_RE2 = enabled
+
+
+def _compile(pattern: str | re.Pattern) -> Any:
+    """
+    Compile regex pattern once and reuse it between search() calls
+    Already compiled re.Pattern is used as is
+    """
+    if isinstance(pattern, re.Pattern):
+        return pattern
+    return _compile_pattern(pattern, _USE_RE2)
+
+
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str, with_re2: bool) -> Any:
+    """
+    with_re2 is a part of the cache key, so use_re2() doesn't return patterns compiled by the other engine
+    Falls back to re on syntax re2 does not support
+    """
+    if with_re2 and isinstance(pattern, str):
+        try:
+            return re2.compile(pattern)
+        except re2.error:
+            pass
+    return re.compile(pattern)
 
 
 def _get_element_or_query_by_index(lst: list, index: int) -> Any:
@@ -80,94 +276,78 @@ def _get_element_or_query_by_index(lst: list, index: int) -> Any:
         return None
 
 
-def _match_query(object_from_list: list | dict, query: dict) -> bool:
+_LOOKUP_COSTS = {None: 1, "gt": 2, "gte": 2, "lt": 2, "lte": 2}
+
+
+class _ClauseTemplate(NamedTuple):
     """
-    Check if object_from_list matches query
-    For example:
-    object_from_list = {
-        'a': {
-            'b': 1
-        },
-        'c': 1
-    }
-    query = {
-        'a.b': 1
-    }
-    returns True
-    """
-    for key, search_value in query.items():
-        path = key.split(".")
-        if not _match_path(object_from_list, path, search_value):
-            return False
-    return True
-
-
-def _match_path(  # noqa: PLR0911
-        object_from_list: list | dict,
-        path: str,
-        search_value: Any,
-        operator: str | None = None,
-) -> bool:
-    """
-    Searching search_value in object by path
-    For example:
-    object_from_list = {
-        'a': {
-            'b': 1
-        },
-        'c': 1
-    }
-    path = 'a.b'
-    search_value = 1
-    returns True
-    """
-    if not path:
-        if operator:
-            match operator:
-                case "in":
-                    return object_from_list in search_value
-                case "contains":
-                    return search_value in object_from_list
-                case "__contains_elements_from_list":
-                    match search_value:
-                        case list():
-                            return all(item in object_from_list for item in search_value)
-                        case _:
-                            return search_value in object_from_list
-                case "gt":
-                    return object_from_list > search_value
-                case "gte":
-                    return object_from_list >= search_value
-                case "lt":
-                    return object_from_list < search_value
-                case "lte":
-                    return object_from_list <= search_value
-                case "isnull":
-                    return bool(object_from_list) != search_value
-        return object_from_list == search_value
-
-    key = path[0]
-    rest = path[1:]
-    operator = (
-        key.split("__")[-1]
-        if any(path[0].endswith(operator) for operator in SUPPORTED_FILTERING_LOOKUPS)
-        else None
-    )
-    # we remove operator from the key
-    for lookup in SUPPORTED_FILTERING_LOOKUPS:
-        if key.endswith(lookup):
-            key = key[: -len(lookup)]
-            break
-
-    if isinstance(object_from_list, dict):
-        if key in object_from_list:
-            # we call it recursively and pass path from the current rest
-            return _match_path(object_from_list[key], rest, search_value, operator)
-        return False
-    elif isinstance(object_from_list, list):
-        # check if any item in the list matches the path
-        return _match_path(object_from_list, path, search_value, operator)
-    return False
-
-
-__all__ = ["search"]
+    Clause without value: everything that depends only on the query key
+    key is the original query key, the value is taken from the query by it
+    """
+    key: str
+    path: tuple[str, ...]
+    operator: str | None
+    compare: Callable[[Any, Any], bool]
+
+
+def _compile_query(query: dict) -> list[Clause]:
+    """
+    Turn the query fields into the list of clauses (path + lookup operator + value)
+    Reserved keys (__index__, __regex__) are skipped, they are handled by isearch() itself
+    Parsing of the keys is cached (see _compile_query_structure()),
+    so queries with the same keys and different values are compiled only once
+    """
+    return [
+        Clause(
+            template.path,
+            template.operator,
+            _prepare_value(template.operator, query[template.key]),
+            template.compare,
+        )
+        for template in _compile_query_structure(tuple(query))
+    ]
+
+
+@lru_cache(maxsize=1024)
+def _compile_query_structure(keys: tuple[str, ...]) -> tuple[_ClauseTemplate, ...]:
+    """
+    Parse query keys (except reserved ones) into the clause templates
+    Empty result means the query has no fields to check
+    Lookup is taken from the last part of the path, e.g. 'a.b__gte' -> path ('a', 'b'), operator 'gte'
+    Clauses are sorted from the cheapest to the most expensive one,
+    so match_query() fails on the element as early as possible
+    """
+    templates = []
+    for key in keys:
+        if key.startswith("__"):
+            continue
+        head, sep, tail = key.rpartition("__")
+        operator = tail if sep and tail in _LOOKUP_NAMES else None
+        # we remove operator from the key
+        path = tuple((head if operator else key).split("."))
+        templates.append(_ClauseTemplate(key, path, operator, OPERATORS[operator]))
+    templates.sort(key=_get_clause_cost)  # sort is stable, clauses with the same cost keep query order
+    return tuple(templates)
+
+
+def _prepare_value(operator: str | None, search_value: Any) -> Any:
+    if operator == "in" and isinstance(search_value, list | tuple | set):
+        try:
+            # membership check becomes O(1) instead of scanning the list for every element
+            return frozenset(search_value)
+        except TypeError:  # unhashable values (e.g. dicts) - keep the list as is
+            pass
+    return search_value
+
+
+def _get_clause_cost(clause: _ClauseTemplate) -> int:
+    """
+    Static cost of the clause check:
+    equality < comparison < other lookups (member / length checks) < nested path (the deeper the costlier)
+    """
+    if len(clause.path) > 1:
+        return 5 + len(clause.path)
+    return _LOOKUP_COSTS.get(clause.operator, 3)
+
+
+__all__ = ["search", "isearch", "search_vectorized", "use_re2"]
@@ -22,4 +22,8 @@ setup(
     ],
     python_requires='>=3.9',
     install_requires=[],
+    extras_require={
+        'vectorized': ['numpy'],
+        're2': ['google-re2'],
+    },
 )